@@ -1,226 +1,394 @@
 #!/usr/bin/env python3
 
-import argparse
 import logging
 import os
-import brdignore
-import brdanalyzer
-import platform
-
-
-# Parse command line arguments
-try:
-    parser = argparse.ArgumentParser(
-                    prog='BRD Code Plagiarism Checker',
-                    description='Compares code using symbolic standardization and winnowing hashes to detect plagiarism',
-                    epilog='Use responsibly. Suspected plagiarists still deserve every human right. Have you been clear on your expectations?')
-
-    parser.add_argument('input_directory', help="Perform an N^2 comparison among every file in this directory. To ignore certain file extensions, create a .brdignore file with a newline-separated list of wildcards to ignore.")
-    
-    parser.add_argument('-r', '--recursive',
-                    action='store_true', help="Compare all files in subdirectories of input_directory recursively. Note: Project structure comparison is not currently supported.")
-    
-    parser.add_argument('-c', '--cluster',
-                    action='store_true', help="Cluster pairwise outputs into groups of similar files.")
-    
-    parser.add_argument('-v', '--verbose',
-                    action='store_true', help="Show warning messages.")
-    
-    parser.add_argument('-vv', '--very-verbose',
-                    action='store_true', help="Be very verbose, but not painfully so.")
-    
-    parser.add_argument('-d', '--debug',
-                    action='store_true', help="Show every log message. May be painful.")
-    
-    parser.add_argument('-mf', '--max-filecount', default=1000, help="Set the max number of files to be compared. Default 1000 If raising this limit, remember this tool runs in n^2 time.")      
-    
-    parser.add_argument('-ms', '--max-size', default=100, help="Set the max size files to be compared in MB. Default 100. If raising this limit, watch out for RAM use and swapping causing slowdowns.") 
-    
-    parser.add_argument('-w', '--winnowing_hash_threshold',  default=brdanalyzer.WINNOWNING_DEFAULT_THRESHOLD,            
-                        help=f"Overwrite the default winnowing test threshold of {brdanalyzer.WINNOWNING_DEFAULT_THRESHOLD}") 
-    
-    parser.add_argument('-t', '--tokenized_ngram_threshold', default=brdanalyzer.TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD, 
-                        help=f"Overwrite the default tokenized Ngrams test threshold of {brdanalyzer.TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD}") 
-    
-    parser.add_argument('-s', '--whitespace_threshold',      default=brdanalyzer.WHITESPACE_GESTALT_DEFAULT_THRESHOLD,    
-                        help=f"Overwrite the default whitespace gestalt test threshold of {brdanalyzer.WHITESPACE_GESTALT_DEFAULT_THRESHOLD}") 
-    
-    parser.add_argument('-o', '--outfile', default="brd_report.md", help="Tell BRD where to write its output report. BRD avoids ovewriting previous reports by adding an incremental counter.")      
-    
-    parser.add_argument('-k', '--clobber-prior-outfile',
-                    action='store_true', help="overwrite any previous report file with the same outfile name.")
-
-    args = parser.parse_args()
-except Exception as err:
-    print(f"Error parsing command line arguments: {type(err)}: {err}")
-    exit(1)
-
-# Initialize logger
-try:
-    brd_logger = logging.getLogger('brd_log')
-    brd_logger.setLevel(logging.DEBUG)
-
-    console_handler = logging.StreamHandler()
-    log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    console_handler.setFormatter(log_formatter)
-
-    if args.debug:
-        console_handler.setLevel(logging.DEBUG)
-        print("Log level set to DEBUG")
-    elif args.very_verbose:
-        console_handler.setLevel(logging.INFO)
-    elif args.verbose:    
-        console_handler.setLevel(logging.WARNING)
-    else:
-        console_handler.setLevel(logging.ERROR)
+from brderror import brderror
+
+brd_logger = logging.getLogger('brd_log')
+
+MAX_FILECOUNT_DEFAULT = 1000
+MAX_SIZE_DEFAULT = 100
+# The most seconds a single exact comparison is estimated to take before it is approximated instead
+# Each test estimates its own cost, and at this budget two typical 20KB source files are still compared exactly
+COMPARISON_BUDGET_DEFAULT = 60
+
+
+# Get list of files to compare from a directory, honoring its .brdignore file
+# input_directory may also be a zip or tar archive, in which case a dict mapping member paths to
+# brdarchivemember objects is returned. Members are only decompressed by analyze(), after it has checked their sizes,
+# and nested archives over max_size MB are refused before they are decompressed
+# Raises brderror with the command line exit code if the directory can't be used
+def discover_files(input_directory, recursive=False, max_size=MAX_SIZE_DEFAULT):
+    import brdignore
 
-    
-    brd_logger.addHandler(console_handler)
+    try:
 
-    brd_logger.info("BRD Logger Instantiated")
+        # ensure input_dir is a directory
+        if not os.path.exists(input_directory):
+            raise brderror(f"Given input directory path does not exist: {input_directory}", 4)
+        brd_logger.info("Given input_directory path exists")
 
-except Exception as err:
-    print(f"Error setting up BRD logger: {type(err)}: {err}")
-    exit(2)
+        if os.path.isfile(input_directory):
+            import brdarchive
+            if brdarchive.is_archive(input_directory):
+                brd_logger.info("Given input_directory path points to an archive")
+                return _discover_archive_members(input_directory, recursive, max_size)
 
-# Warn Windows users of compatibility issues
-if platform.system() == "Windows":
-    brd_logger.warn("BRD is not tested in Windows, and may behave unexpectedly.")
+        # ensure input_dir is a directory
+        if not os.path.isdir(input_directory):
+            raise brderror(f"Given input directory path is not a directory: {input_directory}", 5)
+        brd_logger.info("Given input_directory path points to a directory")
 
-# Get list of files to compare
+        # ensure input_dir is non-empty
+        if len(os.listdir(input_directory)) == 0:
+            raise brderror(f"Given input directory exists, but is empty: {input_directory}", 6)
+        brd_logger.info("Given input_directory path points to a non-empty directory")
+
+        # look for a .brdignore file
+        brdignore_path = os.path.join(input_directory, ".brdignore")
+        brdignore_exists = os.path.exists(brdignore_path)
+
+        # if the .brdignore file exists, check that it is formatted correctly
+        if brdignore_exists:
+            brd_logger.info("Found a .brdignore file")
+            brdign = brdignore.brdignorelist(brdignore_path)
+            brd_logger.debug("Done loading brdignore")
+        else:
+            brd_logger.info(f"No .brdignore found")
+
+        # load every filepath within input_dir
+        if recursive:
+            def load_contents(running_list, path):
+                brd_logger.debug(f"Recursing through the directory {path}")
+                for item in os.listdir(path):
+                    itempath = os.path.join(path, item)
+                    if os.path.isfile(itempath):
+                        running_list.append(itempath)
+                    elif os.path.isdir(itempath):
+                        load_contents(running_list, itempath)
+            list_of_contents = []
+            load_contents(list_of_contents, input_directory)
+        else:
+            list_of_contents = list(os.path.join(input_directory, a) for a in os.listdir(input_directory))
+
+        # clean out every directory path
+        list_of_files = []
+        brd_logger.debug(f"Going through {len(list_of_contents)} paths to remove symlinks and directory paths.")
+        for node in list_of_contents:
+            if os.path.isfile(node) and not os.path.islink(node):
+                if brdignore_exists:
+                    rule = brdign.ignore(node)
+                    if rule is None:
+                        list_of_files.append(node)
+                    else:
+                        brd_logger.debug(f"Removing path {node} because it matches a .brdignore directive: {rule}.")
+                else:
+                    list_of_files.append(node)
+            else:
+                brd_logger.debug(f"Removing path {node} because it is not a file.")
+
+
+        brd_logger.debug(f"Resultant list of files has length: {len(list_of_files)}")
+
+        # check that the resultant list of paths is non-empty
+        if len(list_of_files) == 0:
+            msg = "List of files to compare is empty! "
+            if not recursive:
+                msg += f"Did you mean to specify a recursive discovery of files with the -r flag? "
+            if brdignore_exists:
+                msg += f"Is your .brdignore file too broad?"
+            raise brderror(msg, 11)
+        brd_logger.debug("List of files to compare is not empty")
 
-try:
+    except brderror:
+        raise
+    except Exception as err:
+        raise brderror(f"Error testing given parameters: {type(err)}: {err}", 3) from err
 
-    # ensure input_dir is a directory
-    if not os.path.exists(args.input_directory):
-        brd_logger.error(f"Given input directory path does not exist: {args.input_directory}")
-        exit(4)
-    brd_logger.info("Given input_directory path exists")
+    return list_of_files
 
-    # ensure input_dir is a directory
-    if not os.path.isdir(args.input_directory):
-        brd_logger.error(f"Given input directory path is not a directory: {args.input_directory}")
-        exit(5)
-    brd_logger.info("Given input_directory path points to a directory")
 
-    # ensure input_dir is non-empty
-    if len(os.listdir(args.input_directory)) == 0:
-        brd_logger.error(f"Given input directory exists, but is empty: {args.input_directory}")
-        exit(6)
-    brd_logger.info("Given input_directory path points to a non-empty directory")        
+def _discover_archive_members(archive_path, recursive, max_size):
+    import brdarchive
+
+    archive = brdarchive.brdarchive(archive_path)
+    try:
+        return _filter_archive_members(archive_path, archive.members(recursive, max_size), recursive, max_size)
+    except:
+        archive.close()
+        raise
+
+
+def _filter_archive_members(archive_path, members, recursive, max_size):
+    import brdignore
+
+    # ensure the archive is non-empty
+    if len(members) == 0:
+        raise brderror(f"Given input archive exists, but is empty: {archive_path}", 6)
+    brd_logger.info("Given input archive is non-empty")
+
+    # look for a .brdignore file at the root of the archive
+    brdignore_path = os.path.join(archive_path, ".brdignore")
+    brdignore_exists = brdignore_path in members
 
-    # look for a .brdignore file
-    brdignore_path = os.path.join(args.input_directory, ".brdignore")
-    brdignore_exists = os.path.exists(brdignore_path)
-    
-    # if the .brdignore file exists, check that it is formatted correctly
     if brdignore_exists:
         brd_logger.info("Found a .brdignore file")
-        brdign = brdignore.brdignorelist(brdignore_path)
+        # like every other member, check its size before decompressing it
+        size = members[brdignore_path].size
+        if size / 1000000 > max_size:
+            raise brderror(f"A .brdignore file was found which was larger ({size / 1000000}MB) than the max analysis size ({max_size}MB). You can set this limit with the -ms flag if you have the computational resources to handle larger files. Large file path: {brdignore_path}", 13)
+        brdign = brdignore.brdignorelist(brdignore_path, members[brdignore_path].read())
         brd_logger.debug("Done loading brdignore")
     else:
         brd_logger.info(f"No .brdignore found")
 
-    # load every filepath within input_dir
-    if args.recursive:
-        def load_contents(running_list, path):
-            brd_logger.debug(f"Recursing through the directory {path}")
-            for item in os.listdir(path):
-                itempath = os.path.join(path, item)
-                if os.path.isfile(itempath):
-                    running_list.append(itempath)
-                elif os.path.isdir(itempath):
-                    load_contents(running_list, itempath)
-        list_of_contents = []
-        load_contents(list_of_contents, args.input_directory)
-    else:
-        list_of_contents = list(os.path.join(args.input_directory, a) for a in os.listdir(args.input_directory))
-
-    # clean out every directory path
-    list_of_files = []
-    brd_logger.debug(f"Going through {len(list_of_contents)} paths to remove symlinks and directory paths.")
-    for node in list_of_contents:
-        if os.path.isfile(node) and not os.path.islink(node):
-            if brdignore_exists:
-                rule = brdign.ignore(node)
-                if rule is None:
-                    list_of_files.append(node)
-                else:
-                    brd_logger.debug(f"Removing path {node} because it matches a .brdignore directive: {rule}.")
-            else:
-                list_of_files.append(node)
-        else:
-            brd_logger.debug(f"Removing path {node} because it is not a file.")
+    archive_members = {}
+    for path, member in members.items():
+        if brdignore_exists:
+            rule = brdign.ignore(path)
+            if rule is not None:
+                brd_logger.debug(f"Removing path {path} because it matches a .brdignore directive: {rule}.")
+                continue
+        archive_members[path] = member
 
-        
-    brd_logger.debug(f"Resultant list of files has length: {len(list_of_files)}")
+    brd_logger.debug(f"Resultant list of files has length: {len(archive_members)}")
 
-    # check that the resultant list of paths is non-empty
-    if len(list_of_files) == 0:
+    # check that the resultant list of members is non-empty
+    if len(archive_members) == 0:
         msg = "List of files to compare is empty! "
-        if not args.recursive:
+        if not recursive:
             msg += f"Did you mean to specify a recursive discovery of files with the -r flag? "
         if brdignore_exists:
             msg += f"Is your .brdignore file too broad?"
-        brd_logger.error(msg)
-        exit(11)
+        raise brderror(msg, 11)
     brd_logger.debug("List of files to compare is not empty")
 
+    return archive_members
+
+
+# Check analyze()'s arguments and run the analyzer, returning it
+def _run_analyzer(list_of_files, contents, thresholds, outfile, max_filecount, max_size, top_k, comparison_budget):
+    import brdanalyzer
+
+    if len(list_of_files) == 0:
+        raise brderror("List of files to compare is empty!", 11)
+
     # fail if the list of paths contains too many files per the max-filecount
-    if len(list_of_files) > args.max_filecount:
-        brd_logger.error(f"List of files to compare is longer {len(list_of_files)} than the limit of {args.max_filecount} files")
-        exit(12)
-    brd_logger.debug(f"List of files to compare is not too long {len(list_of_files)}. Max file count is set to {args.max_filecount}")
+    if len(list_of_files) > max_filecount:
+        raise brderror(f"List of files to compare is longer {len(list_of_files)} than the limit of {max_filecount} files", 12)
+    brd_logger.debug(f"List of files to compare is not too long {len(list_of_files)}. Max file count is set to {max_filecount}")
 
     # fail if input_dir contains file(s) larger than max-size
     for file in list_of_files:
-        filesize = (os.path.getsize(file) / 1000000)
-        if filesize > args.max_size:
-            brd_logger.error(f"An input file was found which was larger ({filesize}MB) than the max analysis size ({args.max_size}MB). You can set this limit with the -ms flag if you have the computational resources to handle larger files.")
-            brd_logger.error(f"Large file path: {file}")
-            exit(13)
-    brd_logger.debug(f"List of files to compare does not contain a file too long to process. Max size is set to {args.max_size}MB")
+        try:
+            if contents is None:
+                filesize = (os.path.getsize(file) / 1000000)
+            else:
+                buffer = contents[file]
+                if hasattr(buffer, "read") and not hasattr(buffer, "size"):
+                    buffer = buffer.read()
+                if isinstance(buffer, str):
+                    buffer = buffer.encode()
+                contents[file] = buffer
+                filesize = (buffer.size if hasattr(buffer, "size") else len(buffer)) / 1000000
+        except Exception as err:
+            raise brderror(f"Error testing given parameters: {type(err)}: {err}", 3) from err
+        if filesize > max_size:
+            raise brderror(f"An input file was found which was larger ({filesize}MB) than the max analysis size ({max_size}MB). You can set this limit with the -ms flag if you have the computational resources to handle larger files. Large file path: {file}", 13)
+    brd_logger.debug(f"List of files to compare does not contain a file too long to process. Max size is set to {max_size}MB")
+
+    test_thresholds = {
+                "Whitespace Gestalt Test"       : brdanalyzer.WHITESPACE_GESTALT_DEFAULT_THRESHOLD,
+                "Tokenized Ngrams Test"         : brdanalyzer.TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD,
+                "Winnowing Hash Test"           : brdanalyzer.WINNOWNING_DEFAULT_THRESHOLD
+            }
+    for test, threshold in (thresholds or {}).items():
+        if test not in test_thresholds:
+            raise brderror(f"Unknown similarity test {test}. Known tests are: {list(test_thresholds.keys())}", 14)
+        try:
+            threshold = float(threshold)
+        except (TypeError, ValueError) as err:
+            raise brderror(f"Threshold for {test} must be a number, not {threshold}", 14) from err
+        if not 0 <= threshold <= 10:
+            raise brderror(f"Threshold for {test} must be between 0 and 10, inclusive, not {threshold}", 14)
+        test_thresholds[test] = threshold
+
+    if top_k is not None and (type(top_k) is not int or top_k < 1):
+        raise brderror(f"Top-k must be a positive integer, not {top_k}", 14)
+
+    if comparison_budget is not None:
+        try:
+            comparison_budget = float(comparison_budget)
+        except (TypeError, ValueError) as err:
+            raise brderror(f"Comparison budget must be a number, not {comparison_budget}", 14) from err
+        if not comparison_budget > 0:
+            raise brderror(f"Comparison budget must be positive, not {comparison_budget}", 14)
+
+    brda = brdanalyzer.brdanalyzer(list_of_files, outfile, test_thresholds, contents, top_k, comparison_budget)
+    brd_logger.info("BRD Analyzer Engine initialized")
+
+    brda.do_whitespace_ngrams()
+    brd_logger.info("BRD Analyzer Engine whitespace ngrams test complete")
+
+    brda.do_tokenized_ngrams()
+    brd_logger.info("BRD Analyzer Engine tokenized ngrams test complete")
+
+    brda.do_winnowing_hash()
+    brd_logger.info("BRD Analyzer Engine winnowing hash test complete")
+
+    return brda
+
+
+# Run every similarity test over the given files and return a brdresults object
+#
+# files is either a list of paths, or a dict mapping names to in-memory contents (bytes, str, or a file-like object)
+# File-like objects with a size attribute, such as archive members, are size checked without reading them,
+# then read once per test while it runs, and closed when analyze() returns or raises
+# thresholds maps test names to thresholds between 0 and 10; tests left out use their defaults
+# outfile is where to write a markdown report, or None to skip the report
+# top_k, if given, keeps only each file's top_k best matches per test
+# comparison_budget caps the estimated seconds of one exact comparison; costlier pairs are approximated. None means no cap
+# Raises brderror with the command line exit code instead of exiting
+def analyze(files, thresholds=None, outfile=None, max_filecount=MAX_FILECOUNT_DEFAULT, max_size=MAX_SIZE_DEFAULT, top_k=None, comparison_budget=COMPARISON_BUDGET_DEFAULT):
+    contents = None
+    if isinstance(files, dict):
+        contents = dict(files)
+        list_of_files = list(contents.keys())
+    else:
+        list_of_files = list(files)
+
+    try:
+        brda = _run_analyzer(list_of_files, contents, thresholds, outfile, max_filecount, max_size, top_k, comparison_budget)
+    finally:
+        # close any archives the files were read from
+        for buffer in (contents or {}).values():
+            if hasattr(buffer, "close"):
+                buffer.close()
+
+    if len(brda.approximate) > 0:
+        brd_logger.warning(f"{len(brda.approximate)} comparisons exceeded the comparison budget and were approximated")
+
+    if outfile is not None:
+        brda.write_report()
+
+    return brda.results()
+
+
+def main(argv=None):
+    import argparse
+    import platform
+    import brdanalyzer
+
+    # Parse command line arguments
+    try:
+        parser = argparse.ArgumentParser(
+                        prog='BRD Code Plagiarism Checker',
+                        description='Compares code using symbolic standardization and winnowing hashes to detect plagiarism',
+                        epilog='Use responsibly. Suspected plagiarists still deserve every human right. Have you been clear on your expectations?')
+
+        parser.add_argument('input_directory', help="Perform an N^2 comparison among every file in this directory, or in this .zip, .tar or .tar.gz archive. To ignore certain file extensions, create a .brdignore file with a newline-separated list of wildcards to ignore.")
+
+        parser.add_argument('-r', '--recursive',
+                        action='store_true', help="Compare all files in subdirectories of input_directory recursively. Note: Project structure comparison is not currently supported.")
+
+        parser.add_argument('-c', '--cluster',
+                        action='store_true', help="Cluster pairwise outputs into groups of similar files.")
+
+        parser.add_argument('-v', '--verbose',
+                        action='store_true', help="Show warning messages.")
+
+        parser.add_argument('-vv', '--very-verbose',
+                        action='store_true', help="Be very verbose, but not painfully so.")
+
+        parser.add_argument('-d', '--debug',
+                        action='store_true', help="Show every log message. May be painful.")
+
+        parser.add_argument('-mf', '--max-filecount', default=MAX_FILECOUNT_DEFAULT, type=int, help=f"Set the max number of files to be compared. Default {MAX_FILECOUNT_DEFAULT} If raising this limit, remember this tool runs in n^2 time.")
+
+        parser.add_argument('-ms', '--max-size', default=MAX_SIZE_DEFAULT, type=float, help=f"Set the max size files to be compared in MB. Default {MAX_SIZE_DEFAULT}. If raising this limit, watch out for RAM use and swapping causing slowdowns.")
+
+        parser.add_argument('-w', '--winnowing_hash_threshold',  default=brdanalyzer.WINNOWNING_DEFAULT_THRESHOLD,
+                            help=f"Overwrite the default winnowing test threshold of {brdanalyzer.WINNOWNING_DEFAULT_THRESHOLD}")
+
+        parser.add_argument('-t', '--tokenized_ngram_threshold', default=brdanalyzer.TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD,
+                            help=f"Overwrite the default tokenized Ngrams test threshold of {brdanalyzer.TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD}")
+
+        parser.add_argument('-s', '--whitespace_threshold',      default=brdanalyzer.WHITESPACE_GESTALT_DEFAULT_THRESHOLD,
+                            help=f"Overwrite the default whitespace gestalt test threshold of {brdanalyzer.WHITESPACE_GESTALT_DEFAULT_THRESHOLD}")
+
+        parser.add_argument('--top-k', default=None, type=int, help="Only keep the K closest matches of each file for each test. Uses O(N*K) memory instead of O(N^2), and skips comparisons that cannot make a file's top K.")
+
+        parser.add_argument('-b', '--comparison-budget', default=COMPARISON_BUDGET_DEFAULT, type=float, help=f"Set the most seconds one exact comparison is estimated to take. Costlier pairs get a faster, approximate score, and are marked as approximate in the report. Default {COMPARISON_BUDGET_DEFAULT}. Set to 0 to always compare exactly.")
+
+        parser.add_argument('-o', '--outfile', default="brd_report.md", help="Tell BRD where to write its output report. BRD avoids ovewriting previous reports by adding an incremental counter.")
+
+        parser.add_argument('-k', '--clobber-prior-outfile',
+                        action='store_true', help="overwrite any previous report file with the same outfile name.")
+
+        args = parser.parse_args(argv)
+    except Exception as err:
+        print(f"Error parsing command line arguments: {type(err)}: {err}")
+        exit(1)
+
+    # Initialize logger
+    try:
+        brd_logger.setLevel(logging.DEBUG)
+
+        console_handler = logging.StreamHandler()
+        log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        console_handler.setFormatter(log_formatter)
+
+        if args.debug:
+            console_handler.setLevel(logging.DEBUG)
+            print("Log level set to DEBUG")
+        elif args.very_verbose:
+            console_handler.setLevel(logging.INFO)
+        elif args.verbose:
+            console_handler.setLevel(logging.WARNING)
+        else:
+            console_handler.setLevel(logging.ERROR)
+
 
-except Exception as err:
-    brd_logger.error(f"Error testing given parameters: {type(err)}: {err}")
-    exit(3)
+        brd_logger.addHandler(console_handler)
 
-brd_logger.info(f"Successfully loaded list of input files to compare. Found {len(list_of_files)} files.")
-for file in list_of_files:
-    brd_logger.debug(f"{file}")
+        brd_logger.info("BRD Logger Instantiated")
 
-# Get outfile, and don't clobber the past
-outfile_path = args.outfile
+    except Exception as err:
+        print(f"Error setting up BRD logger: {type(err)}: {err}")
+        exit(2)
 
-if not args.clobber_prior_outfile:
-    while os.path.exists(outfile_path):
-        outfile_path = f"yet_another_{outfile_path}"
+    # Warn Windows users of compatibility issues
+    if platform.system() == "Windows":
+        brd_logger.warn("BRD is not tested in Windows, and may behave unexpectedly.")
 
-# Do analysis
+    # Get outfile, and don't clobber the past
+    outfile_path = args.outfile
 
-assert 0 <= float(args.whitespace_threshold) <= 10
-assert 0 <= float(args.whitespace_threshold) <= 10
-assert 0 <= float(args.whitespace_threshold) <= 10
+    if not args.clobber_prior_outfile:
+        while os.path.exists(outfile_path):
+            outfile_path = f"yet_another_{outfile_path}"
 
-thresholds = {
-            "Whitespace Gestalt Test"       : float(args.whitespace_threshold),
-            "Tokenized Ngrams Test"         : float(args.tokenized_ngram_threshold),
-            "Winnowing Hash Test"           : float(args.winnowing_hash_threshold)
-        }
+    thresholds = {
+                "Whitespace Gestalt Test"       : args.whitespace_threshold,
+                "Tokenized Ngrams Test"         : args.tokenized_ngram_threshold,
+                "Winnowing Hash Test"           : args.winnowing_hash_threshold
+            }
 
-brda = brdanalyzer.brdanalyzer(list_of_files, outfile_path, thresholds)
-brd_logger.info("BRD Analyzer Engine initialized")
+    try:
+        list_of_files = discover_files(args.input_directory, args.recursive, args.max_size)
 
-brda.do_whitespace_ngrams()
-brd_logger.info("BRD Analyzer Engine whitespace ngrams test complete")
+        brd_logger.info(f"Successfully loaded list of input files to compare. Found {len(list_of_files)} files.")
+        for file in list_of_files:
+            brd_logger.debug(f"{file}")
 
-brda.do_tokenized_ngrams()
-brd_logger.info("BRD Analyzer Engine tokenized ngrams test complete")
+        analyze(list_of_files, thresholds, outfile_path, args.max_filecount, args.max_size, args.top_k, args.comparison_budget or None)
+    except brderror as err:
+        brd_logger.error(err)
+        exit(err.code)
 
-brda.do_winnowing_hash()
-brd_logger.info("BRD Analyzer Engine winnowing hash test complete")
+    print("BRD Complete")
+    print(f"Report written to {outfile_path}.")
 
-brda.write_report()
 
-print("BRD Complete")
-print(f"Report written to {outfile_path}.")
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
+import heapq
 import logging
-import threading
-from multiprocessing import cpu_count
-import brdtokenngram, brdwhitespace, brdwinnow
+import os
+from brderror import brderror
 from datetime import datetime
 
 brd_logger = logging.getLogger('brd_log')
@@ -11,23 +11,88 @@ WINNOWNING_DEFAULT_THRESHOLD = 5
 TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD = 5
 WHITESPACE_GESTALT_DEFAULT_THRESHOLD = 5
 
+# The structured outcome of an analysis, for callers using BRD as a library
+class brdresults:
+
+    def __init__(self, filelist, thresholds, scores, pairs, clusters, outfile, approximate, top_k):
+        self.filelist = filelist
+        self.thresholds = thresholds
+        # The k each file's matches were limited to per test, or None if every pair was kept
+        self.top_k = top_k
+        # Pairwise scores, keyed by test name, as [pathA, pathB, score] lists
+        # This is every pair, unless top_k is set, in which case it is only the pairs in some file's top k
+        self.scores = scores
+        # Pairs at or above their test's threshold, as [test name, pathA, pathB, score] lists
+        self.pairs = pairs
+        # Groups of similar files, largest first
+        self.clusters = clusters
+        # Where the report was written, or None if no report was requested
+        self.outfile = outfile
+        # Pairs that exceeded the comparison budget and were scored approximately, as a set of (test name, pathA, pathB) tuples
+        self.approximate = approximate
+
+# Keeps the k best matches of each file as bounded min-heaps, so memory is O(N*k) instead of O(N^2)
+class brdtopk:
+
+    def __init__(self, k):
+        assert type(k) is int and k >= 1, "k must be a positive integer"
+        self.k = k
+        self.heaps = {}
+        self.count = 0
+
+    # The score a new match must beat to get into this file's top k
+    def floor(self, path):
+        heap = self.heaps.get(path, [])
+        if len(heap) < self.k:
+            return float("-inf")
+        return heap[0][0]
+
+    def offer(self, a, b, score):
+        # The counter breaks ties by comparison order, and lets results() keep that order
+        entry = (score, self.count, a, b)
+        self.count += 1
+        for path in (a, b):
+            heap = self.heaps.setdefault(path, [])
+            if len(heap) < self.k:
+                heapq.heappush(heap, entry)
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    # Every pair in some file's top k, in the order they were compared
+    def results(self):
+        entries = set()
+        for heap in self.heaps.values():
+            entries.update(heap)
+        return [[a, b, score] for score, _, a, b in sorted(entries, key=lambda x: x[1])]
+
 class brdanalyzer:
 
-    def __init__(self, filelist, outfile, thresholds):
-        try:
-            with open(outfile, "w") as of:
-                timestamp = datetime.now()
-                of.write(f"# BRD Plagiarism Analysis Engine Automated Report \nGenerated at {timestamp}\n\n")
-        except Exception as err:
-            brd_logger.error(f"Error initializing outfile: {type(err)}: {err}")
-            brd_logger.error(f"Given filepath: {outfile}")
-            exit(42)
-        brd_logger.debug(f"Outfile successfully initialized at {outfile}.")
+    # outfile may be None to skip writing a report
+    # contents may map paths in filelist to their bytes, for files that are already in memory, or to objects to read() them from
+    # top_k may be set to only keep each file's k best matches per test
+    # comparison_budget caps the estimated seconds of one exact comparison, None means no cap
+    def __init__(self, filelist, outfile, thresholds, contents=None, top_k=None, comparison_budget=None):
+        if outfile is not None:
+            try:
+                with open(outfile, "w") as of:
+                    timestamp = datetime.now()
+                    of.write(f"# BRD Plagiarism Analysis Engine Automated Report \nGenerated at {timestamp}\n\n")
+            except Exception as err:
+                raise brderror(f"Error initializing outfile: {type(err)}: {err}. Given filepath: {outfile}", 42) from err
+            brd_logger.debug(f"Outfile successfully initialized at {outfile}.")
         
-        self.threadcount = cpu_count()
+        self.threadcount = os.cpu_count()
         self.filelist = filelist
+        self.contents = contents or {}
         self.outfile = outfile
         self.thresholds = thresholds
+        self.top_k = top_k
+        self.comparison_budget = comparison_budget
+        self.approximate = set()
+        # Each test's fingerprints for approximate comparisons, by file index, computed the first time a file needs them
+        self.fingerprints = {}
+        # Set by _compute_clusters, and reset whenever a test's results change
+        self.pairs = None
         self.default_thresholds = {
             "Whitespace Gestalt Test"       : WHITESPACE_GESTALT_DEFAULT_THRESHOLD,
             "Tokenized Ngrams Test" : TOKENIZED_NGRAMS_TEST_DEFAULT_THRESHOLD,
@@ -36,70 +101,126 @@ class brdanalyzer:
         return None
     
     def do_whitespace_ngrams(self):
+        import brdwhitespace
+        self.pairs = None
         self.whitespace_results = []
         self.whitespace_vectors = []
 
         #TODO parallelize
         for file in self.filelist:
-            self.whitespace_vectors.append(brdwhitespace.file_to_vector(file))
+            self.whitespace_vectors.append(brdwhitespace.file_to_vector(file, self._contents(file)))
         
-        for i, a in enumerate(self.filelist):
-            for j, b in enumerate(self.filelist):
-                if a <= b:
-                    continue #Skip self-comparisions, and duplicates
-                brd_logger.debug(f"Comparing {i}:{a} to {j}:{b}")
-
-                similarity_score = brdwhitespace.compare_vectors(self.whitespace_vectors[i],self.whitespace_vectors[j])
-
-                assert type(similarity_score) in [int, float], f"Similarity Score was not a number, but rather a {type(similarity_score)}"
-
-                self.whitespace_results.append([a, b, similarity_score])
+        self.whitespace_results = self._compare_all(brdwhitespace, self.whitespace_vectors, "Whitespace Gestalt Test")
 
         pass
 
     def do_tokenized_ngrams(self):
+        import brdtokenngram
+        self.pairs = None
         self.tokenized_ngrams_result = []
         self.tokenized_ngrams_vectors = []
 
         brd_logger.warn("Tokenized ngrams not yet implemented correctly. It is currently a gestalt match")
         for file in self.filelist:
-            self.tokenized_ngrams_vectors.append(brdtokenngram.file_to_vector(file))
-
-        for i, a in enumerate(self.filelist):
-            for j, b in enumerate(self.filelist):
-                if a <= b:
-                    continue #Skip self-comparisions, and duplicates
-                brd_logger.debug(f"Comparing {i}:{a} to {j}:{b}")
-
-                similarity_score = brdtokenngram.compare_vectors(self.tokenized_ngrams_vectors[i],self.tokenized_ngrams_vectors[j])
+            self.tokenized_ngrams_vectors.append(brdtokenngram.file_to_vector(file, self._contents(file)))
 
-                assert type(similarity_score) in [int, float], f"Similarity Score was not a number, but rather a {type(similarity_score)}"
-
-                self.tokenized_ngrams_result.append([a, b, similarity_score])
+        self.tokenized_ngrams_result = self._compare_all(brdtokenngram, self.tokenized_ngrams_vectors, "Tokenized Ngrams Test")
         #TODO parallelize
         pass
 
     def do_winnowing_hash(self):
+        import brdbatch, brdwinnow
+        self.pairs = None
         self.winnowing_hash_result = []
         self.winnowing_hash_vectors = []
 
         brd_logger.warn("Winnowing hashes not yet implemented")
         for file in self.filelist:
-            self.winnowing_hash_vectors.append(brdwinnow.file_to_vector(file))
+            self.winnowing_hash_vectors.append(brdwinnow.file_to_vector(file, self._contents(file)))
+
+        # Winnowing scores are set overlaps, so score every pair at once when numpy is available
+        try:
+            scores = brdbatch.iter_set_similarity_scores(self.filelist, self.winnowing_hash_vectors)
+            if self.top_k is None:
+                self.winnowing_hash_result = list(scores)
+            else:
+                best = brdtopk(self.top_k)
+                for a, b, similarity_score in scores:
+                    best.offer(a, b, similarity_score)
+                self.winnowing_hash_result = best.results()
+            return
+        except ImportError:
+            brd_logger.info("numpy is not installed, falling back to per-pair winnowing comparisons")
+
+        self.winnowing_hash_result = self._compare_all(brdwinnow, self.winnowing_hash_vectors, "Winnowing Hash Test")
+        #TODO parallelize
+        pass
+
+    # The bytes of a file given in memory, or None if it should be read from disk
+    # Archive members are decompressed here, once per test, and dropped once vectorized, so only one is held at a time
+    def _contents(self, file):
+        buffer = self.contents.get(file)
+        if hasattr(buffer, "read"):
+            try:
+                buffer = buffer.read()
+            except Exception as err:
+                raise brderror(f"Error reading {file}: {type(err)}: {err}", 3) from err
+        return buffer
+
+    # Compare every pair of vectors with the given test module, returning [pathA, pathB, score] lists
+    # In top-k mode, pairs whose module.upper_bound can't beat either file's current k-th best match are skipped
+    # Pairs costing more than the comparison budget use module.approximate_compare_vectors, and are noted in self.approximate
+    # if they are among the returned results
+    def _compare_all(self, module, vectors, test):
+        results = []
+        best = None
+        if self.top_k is not None:
+            best = brdtopk(self.top_k)
+        fingerprints = self.fingerprints[test] = {}
+        self.approximate = {pair for pair in self.approximate if pair[0] != test}
+        approximated = set()
 
         for i, a in enumerate(self.filelist):
             for j, b in enumerate(self.filelist):
                 if a <= b:
                     continue #Skip self-comparisions, and duplicates
+
+                approximate = self.comparison_budget is not None and hasattr(module, "approximate_compare_vectors") \
+                        and module.comparison_cost(vectors[i], vectors[j]) > self.comparison_budget
+
+                # upper_bound only bounds the exact score, so approximated pairs are never skipped
+                if best is not None and not approximate and hasattr(module, "upper_bound"):
+                    floor = min(best.floor(a), best.floor(b))
+                    if floor > float("-inf") and module.upper_bound(vectors[i], vectors[j]) <= floor:
+                        brd_logger.debug(f"Skipping {i}:{a} to {j}:{b}, it cannot make either file's top {self.top_k}")
+                        continue
+
                 brd_logger.debug(f"Comparing {i}:{a} to {j}:{b}")
 
-                similarity_score = brdwinnow.compare_vectors(self.winnowing_hash_vectors[i],self.winnowing_hash_vectors[j])
+                if approximate:
+                    brd_logger.info(f"Comparing {a} to {b} would exceed the comparison budget of {self.comparison_budget} seconds, approximating the {test} score")
+                    for k in (i, j):
+                        if k not in fingerprints:
+                            fingerprints[k] = module.vector_to_fingerprints(vectors[k])
+                    similarity_score = module.approximate_compare_vectors(fingerprints[i], fingerprints[j])
+                    approximated.add((test, a, b))
+                else:
+                    similarity_score = module.compare_vectors(vectors[i], vectors[j])
 
                 assert type(similarity_score) in [int, float], f"Similarity Score was not a number, but rather a {type(similarity_score)}"
 
-                self.winnowing_hash_result.append([a, b, similarity_score])    
-        #TODO parallelize
-        pass
+                if best is None:
+                    results.append([a, b, similarity_score])
+                else:
+                    best.offer(a, b, similarity_score)
+
+        if best is not None:
+            results = best.results()
+            # only note the approximated pairs top-k kept, so the count matches the scores
+            kept = {(test, a, b) for a, b, _ in results}
+            approximated &= kept
+        self.approximate |= approximated
+        return results
 
     def _compute_clusters(self):
         try:
@@ -131,8 +252,7 @@ class brdanalyzer:
                         self.pairs.append([result_src] + result)
 
         except Exception as err:
-            brd_logger.error(f"Error while calculating pairs: {type(err)}: {err}")
-            exit(70)
+            raise brderror(f"Error while calculating pairs: {type(err)}: {err}", 70) from err
         try:
             self.pairgraph = {}
 
@@ -171,13 +291,32 @@ class brdanalyzer:
                 brd_logger.info(list(cluster))
 
         except Exception as err:
-            brd_logger.error(f"Error while calculating clusters: {type(err)}: {err}")
-            raise(err)
-            exit(71)
+            raise brderror(f"Error while calculating clusters: {type(err)}: {err}", 71) from err
+
+    def results(self):
+        if self.pairs is None:
+            self._compute_clusters()
+
+        return brdresults(
+            self.filelist,
+            self.thresholds,
+            {
+                "Whitespace Gestalt Test" : self.whitespace_results,
+                "Tokenized Ngrams Test" : self.tokenized_ngrams_result,
+                "Winnowing Hash Test" : self.winnowing_hash_result
+            },
+            self.pairs,
+            sorted(list(self.clusters), key=lambda x: len(x), reverse=True),
+            self.outfile,
+            self.approximate,
+            self.top_k
+        )
+
     def write_report(self):
         brd_logger.info("Preparing to write report")
 
-        self._compute_clusters()
+        if self.pairs is None:
+            self._compute_clusters()
 
 
         # Actually write the report:
@@ -197,12 +336,20 @@ class brdanalyzer:
                 if len(self.clusters) == 1:
                     waswere = "was 1 group"
 
+                approximate = ""
+                if len(self.approximate) > 0:
+                    approximate = f"\n{len(self.approximate)} comparisons were too large to finish within the comparison budget, so their scores were approximated. Approximate scores are marked with a ~ below.\n"
+
+                topk = ""
+                if self.top_k is not None:
+                    topk = f"\nOnly the {self.top_k} closest matches of each file were kept for each test, so a file may be similar to more files than are listed here.\n"
+
                 msg += f"""## TLDR
 The BRD analyzer ran over {len(self.filelist)} files and identified {len(self.pairs)} suspiciously similar pairs of files.
 
 
 After grouping similar files, it appears that there {waswere} of collaborators who shared code or worked with similar reference material.
-                
+{topk}{approximate}                
 ## Similarity Tests Used
 
 BRD uses a combination of techniques to detect similarities among files.
@@ -260,7 +407,8 @@ The following sets of similar files are strongly connected (in the graph theory
                             PathA = pair[1]
                             PathB = pair[2]
                             
-                            msg += f"| {PathA.replace('_', md_escaped_backslash)} | {PathB.replace('_', md_escaped_backslash)} | {pair[3]:.2f}| {pair[0]} |\n"
+                            approx = "~" if (pair[0], PathA, PathB) in self.approximate else ""
+                            msg += f"| {PathA.replace('_', md_escaped_backslash)} | {PathB.replace('_', md_escaped_backslash)} | {approx}{pair[3]:.2f}| {pair[0]} |\n"
 
                 msg += "\n\n```\n==========================\nEnd Auto Generated Report\n==========================\n```"
 
@@ -268,6 +416,4 @@ The following sets of similar files are strongly connected (in the graph theory
                 brd_logger.debug(msg)
 
         except Exception as err:
-            brd_logger.error(f"Error writing outfile: {type(err)}: {err}")
-            brd_logger.error(f"Given filepath: {self.outfile}")
-            exit(99)
+            raise brderror(f"Error writing outfile: {type(err)}: {err}. Given filepath: {self.outfile}", 99) from err
@@ -0,0 +1,28 @@
+import logging
+import re
+from collections import Counter
+
+brd_logger = logging.getLogger('brd_log')
+
+line_regex = re.compile(r'[^\n]*\n|[^\n]+$')
+
+# turn a sequence into a multiset of fingerprints, one per pair of consecutive lines
+# Single characters, or even short runs of them, are too common in whitespace vectors to tell files apart,
+# while a pair of whole lines rarely matches by chance, which keeps the approximation from overestimating.
+# The fingerprints are hashes, which keeps them small; only matches between them are counted, so the score
+# does not depend on the hash values.
+# This is meant to be computed once per file and test, and then reused for every pair that needs it.
+def line_fingerprints(sequence):
+    lines = line_regex.findall("".join(sequence))
+    return Counter(map(hash, zip(lines, lines[1:])))
+
+# return an approximate gestalt similarity score between 0-10 from two files' line_fingerprints
+# like ratio(), this is 2 * matches / total, but matches are shared consecutive line pairs rather than matching blocks
+def approximate_ratio(fingerprints_a, fingerprints_b):
+    total = sum(fingerprints_a.values()) + sum(fingerprints_b.values())
+    if total == 0:
+        return 0
+    matches = sum(min(fingerprints_a[f], fingerprints_b[f]) for f in fingerprints_a.keys() & fingerprints_b.keys())
+    similarity_score = 2 * matches / total * 10
+    brd_logger.debug(f"Approximate comparison yielded a score of: {similarity_score}")
+    return similarity_score
@@ -0,0 +1,112 @@
+import io
+import logging
+import os
+import tarfile
+import zipfile
+from brderror import brderror
+
+brd_logger = logging.getLogger('brd_log')
+
+ZIP_EXTENSIONS = (".zip",)
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz")
+
+# Return True if the path names a zip or tar archive BRD can read submissions from
+def is_archive(path):
+    return path.lower().endswith(ZIP_EXTENSIONS + TAR_EXTENSIONS)
+
+# One file inside an archive
+# size comes from the archive's metadata, so it can be checked before anything is decompressed
+class brdarchivemember:
+
+    def __init__(self, path, size, archive, info):
+        self.path = path
+        self.size = size
+        self.archive = archive
+        self.info = info
+
+    # decompress the member, straight from the archive into memory
+    # Nothing is kept, so each call decompresses it again and the caller decides how long the bytes live
+    def read(self):
+        with self.archive.open_member(self.info) as member:
+            return member.read()
+
+    # close the archive this member came from, along with every archive nested in it
+    def close(self):
+        self.archive.root().close()
+
+# An open zip or tar archive, which stays open until close() so its members can be read on demand
+class brdarchive:
+
+    # path names the archive in member paths
+    # fileobj may hold the archive's bytes instead of reading path, for archives nested in other archives
+    def __init__(self, path, fileobj=None, parent=None):
+        self.path = path
+        self.parent = parent
+        self.children = []
+        self.closed = False
+
+        source = path if fileobj is None else fileobj
+        if path.lower().endswith(ZIP_EXTENSIONS):
+            self.archive = zipfile.ZipFile(source)
+        elif fileobj is None:
+            self.archive = tarfile.open(path)
+        else:
+            self.archive = tarfile.open(fileobj=fileobj)
+
+    def root(self):
+        archive = self
+        while archive.parent is not None:
+            archive = archive.parent
+        return archive
+
+    def open_member(self, info):
+        if isinstance(self.archive, zipfile.ZipFile):
+            return self.archive.open(info)
+        return self.archive.extractfile(info)
+
+    # (name, size, info) for every regular file in the archive, from its metadata alone
+    def _entries(self):
+        if isinstance(self.archive, zipfile.ZipFile):
+            return [(info.filename, info.file_size, info) for info in self.archive.infolist() if not info.is_dir()]
+        return [(info.name, info.size, info) for info in self.archive.getmembers() if info.isfile()]
+
+    # Return a dict mapping member paths, prefixed with this archive's path, to brdarchivemember objects
+    # Member directories and nested archives are only descended into when recursive is set
+    # A nested archive larger than max_size MB raises brderror before it is decompressed
+    def members(self, recursive=False, max_size=None):
+        members = {}
+
+        for name, size, info in self._entries():
+            while name.startswith("./"):
+                name = name[2:]
+            path = os.path.join(self.path, name)
+
+            if "/" in name and not recursive:
+                brd_logger.debug(f"Skipping archive member {path} because it is in a subdirectory.")
+                continue
+
+            if is_archive(name):
+                if not recursive:
+                    brd_logger.debug(f"Skipping nested archive {path}. Use the -r flag to compare the files inside it.")
+                    continue
+                if max_size is not None and size / 1000000 > max_size:
+                    raise brderror(f"A nested archive was found which was larger ({size / 1000000}MB) than the max analysis size ({max_size}MB). You can set this limit with the -ms flag if you have the computational resources to handle larger files. Large file path: {path}", 13)
+                brd_logger.debug(f"Recursing through the nested archive {path}")
+                with self.open_member(info) as nested:
+                    nested_archive = brdarchive(path, io.BytesIO(nested.read()), self)
+                self.children.append(nested_archive)
+                members.update(nested_archive.members(recursive, max_size))
+                continue
+
+            members[path] = brdarchivemember(path, size, self, info)
+
+        return members
+
+    # close this archive and every archive nested in it; closing twice is harmless
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for child in self.children:
+            child.close()
+        self.archive.close()
@@ -0,0 +1,91 @@
+import logging
+
+brd_logger = logging.getLogger('brd_log')
+
+BATCH_DEFAULT_ROW_BLOCK = 256
+BATCH_DEFAULT_FEATURE_BLOCK = 4096
+
+# return a jaccard similarity score between 0-10 for two fingerprint sets
+# this is the per-pair reference that set_similarity_scores must agree with
+def jaccard_score(a, b):
+    a = set(a)
+    b = set(b)
+    union = len(a | b)
+    if union == 0:
+        return 0
+    return len(a & b) / union * 10
+
+# an upper bound on jaccard_score that only needs the set sizes
+def jaccard_upper_bound(a, b):
+    smaller, larger = sorted([len(set(a)), len(set(b))])
+    if larger == 0:
+        return 0
+    return smaller / larger * 10
+
+# compute the jaccard score of every pair of fingerprint sets at once
+#
+# The fingerprint sets are treated as a sparse file x fingerprint incidence matrix M.
+# Intersection counts are M @ M.T, computed in blocks of rows (files) and columns (fingerprints)
+# so that at most row_block x filecount scores and filecount x feature_block incidences are held at once.
+# Pairs are returned in the same order, and with the same scores, as the per-pair loops in brdanalyzer.
+# Raises ImportError if numpy is not installed, so callers can fall back to the per-pair path.
+def set_similarity_scores(filelist, vectors, row_block=BATCH_DEFAULT_ROW_BLOCK, feature_block=BATCH_DEFAULT_FEATURE_BLOCK):
+    return list(iter_set_similarity_scores(filelist, vectors, row_block, feature_block))
+
+# the same as set_similarity_scores, but yields each [pathA, pathB, score] as its block is done
+def iter_set_similarity_scores(filelist, vectors, row_block=BATCH_DEFAULT_ROW_BLOCK, feature_block=BATCH_DEFAULT_FEATURE_BLOCK):
+    import numpy as np
+
+    assert len(filelist) == len(vectors), "Every file must have exactly one vector"
+    filecount = len(filelist)
+    if filecount < 2:
+        return
+
+    # number every distinct fingerprint, and record which files hold it
+    feature_ids = {}
+    rows = []
+    cols = []
+    for i, vector in enumerate(vectors):
+        for fingerprint in set(vector):
+            rows.append(i)
+            cols.append(feature_ids.setdefault(fingerprint, len(feature_ids)))
+    featurecount = len(feature_ids)
+    brd_logger.debug(f"Batched set scoring over {filecount} files and {featurecount} distinct fingerprints")
+
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    order = np.argsort(cols, kind="stable")
+    rows = rows[order]
+    cols = cols[order]
+    sizes = np.bincount(rows, minlength=filecount).astype(np.float64)
+
+    # pair (i, j) is kept iff filelist[i] > filelist[j], matching the "a <= b: continue" skip
+    _, ranks = np.unique(np.asarray(filelist, dtype=object), return_inverse=True)
+    ranks = ranks.reshape(-1)
+
+    for r0 in range(0, filecount, row_block):
+        r1 = min(r0 + row_block, filecount)
+        intersections = np.zeros((r1 - r0, filecount), dtype=np.float64)
+
+        for f0 in range(0, featurecount, feature_block):
+            f1 = min(f0 + feature_block, featurecount)
+            lo, hi = np.searchsorted(cols, [f0, f1])
+            if lo == hi:
+                continue
+            incidence = np.zeros((filecount, f1 - f0), dtype=np.float64)
+            incidence[rows[lo:hi], cols[lo:hi] - f0] = 1
+            intersections += incidence[r0:r1] @ incidence.T
+
+        unions = sizes[r0:r1, None] + sizes[None, :] - intersections
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(unions > 0, intersections / unions * 10, 0)
+
+        keep = ranks[r0:r1, None] > ranks[None, :]
+        debug = brd_logger.isEnabledFor(logging.DEBUG)
+        for i, j in zip(*np.nonzero(keep)):
+            a = filelist[r0 + i]
+            b = filelist[j]
+            if debug:
+                brd_logger.debug(f"Compared {r0 + i}:{a} to {j}:{b}")
+            score = scores[i, j].item() if unions[i, j] > 0 else 0
+            yield [a, b, score]
@@ -0,0 +1,7 @@
+# Raised instead of calling exit(), so BRD can be used as a library.
+# The command line interface turns these back into the matching exit code.
+class brderror(Exception):
+
+    def __init__(self, message, code=1):
+        super().__init__(message)
+        self.code = code
@@ -1,4 +1,6 @@
 import logging
+import brdapprox
+from brderror import brderror
 import difflib
 import re
 
@@ -6,27 +8,29 @@ brd_logger = logging.getLogger('brd_log')
 
 # turn a file into a comparable vector
 # for tokenized_ngrams, we need to read the paper
-def file_to_vector(filepath):
+# contents may hold the file's bytes if they are already in memory
+def file_to_vector(filepath, contents=None):
 
     vector = []
 
     try:
-        with open(filepath, "rb") as infile:
-            raw_contents = infile.read().decode(errors="backslashreplace")
+        if contents is None:
+            with open(filepath, "rb") as infile:
+                contents = infile.read()
+        raw_contents = contents.decode(errors="backslashreplace")
 
-            # shorten sequences of > 2 newlines
-            cut_vspace = r'\r?[\n]\r?[\n]\r?[\n]+'
-            two_newlines = "\n\n"
-            if "\r" in raw_contents:
-                two_newlines = "\r\n\r\n"
-            
-            raw_contents_trimmed = re.sub(cut_vspace, two_newlines, raw_contents)
+        # shorten sequences of > 2 newlines
+        cut_vspace = r'\r?[\n]\r?[\n]\r?[\n]+'
+        two_newlines = "\n\n"
+        if "\r" in raw_contents:
+            two_newlines = "\r\n\r\n"
+        
+        raw_contents_trimmed = re.sub(cut_vspace, two_newlines, raw_contents)
 
-            vector = raw_contents_trimmed
+        vector = raw_contents_trimmed
 
     except Exception as err:
-        brd_logger.error(f"Error turning {filepath} to a comparable vector: {type(filepath)}: {err}")
-        exit(55)
+        raise brderror(f"Error turning {filepath} to a comparable vector: {type(err)}: {err}", 55) from err
 
     return vector
 
@@ -43,4 +47,27 @@ def compare_vectors(a, b):
     similarity_score2 = S.ratio() * 10
     similarity_score = (similarity_score1 + similarity_score2) / 2
     brd_logger.debug(f"Comparison yielded a score of: {similarity_score}")
-    return similarity_score
\ No newline at end of file
+    return similarity_score
+
+# return a score that compare_vectors(a, b) can not exceed, cheaply
+# quick_ratio counts shared characters regardless of order, so it bounds both ratio() calls
+def upper_bound(a, b):
+    S.set_seq1(a)
+    S.set_seq2(b)
+    return S.quick_ratio() * 10
+
+# autojunk keeps most characters of longer files from seeding matches, so ratio() is far cheaper per character pair than for whitespace
+# Measured on typical source files; compare_vectors takes about this many seconds per len(a) * len(b)
+SECONDS_PER_COMPARISON_CELL = 3e-9
+
+# return roughly how many seconds compare_vectors(a, b) would take
+def comparison_cost(a, b):
+    return len(a) * len(b) * SECONDS_PER_COMPARISON_CELL
+
+# turn a vector into the fingerprints approximate_compare_vectors works on
+def vector_to_fingerprints(vector):
+    return brdapprox.line_fingerprints(vector)
+
+# return an approximate score from two vectors' fingerprints, for pairs too costly to compare exactly
+def approximate_compare_vectors(fingerprints_a, fingerprints_b):
+    return brdapprox.approximate_ratio(fingerprints_a, fingerprints_b)
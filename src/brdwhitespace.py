@@ -1,4 +1,6 @@
 import logging
+import brdapprox
+from brderror import brderror
 import re
 import difflib
 
@@ -6,33 +8,35 @@ brd_logger = logging.getLogger('brd_log')
 
 # turn a file into a comparable vector
 # for whitespace, we remove every non-whitespace character and then do Ratcliff-Obershelp "gestalt pattern matching"
-def file_to_vector(filepath):
+# contents may hold the file's bytes if they are already in memory
+def file_to_vector(filepath, contents=None):
 
     vector = []
 
     try:
-        with open(filepath, "rb") as infile:
+        if contents is None:
+            with open(filepath, "rb") as infile:
+                contents = infile.read()
 
-            raw_contents = infile.read().decode(errors="backslashreplace")
+        raw_contents = contents.decode(errors="backslashreplace")
 
-            substitution_regex = r'[^\s]+'
+        substitution_regex = r'[^\s]+'
 
-            whitespace_only = "".join(list(re.sub(substitution_regex,"",raw_contents)))
+        whitespace_only = "".join(list(re.sub(substitution_regex,"",raw_contents)))
 
-            # shorten sequences of > 2 newlines
-            cut_vspace = r'\r?[\n]\r?[\n]\r?[\n]+'
-            two_newlines = "\n\n"
-            if "\r" in whitespace_only:
-                two_newlines = "\r\n\r\n"
-            
-            whitespace_only_trimmed = re.sub(cut_vspace, two_newlines, whitespace_only)
+        # shorten sequences of > 2 newlines
+        cut_vspace = r'\r?[\n]\r?[\n]\r?[\n]+'
+        two_newlines = "\n\n"
+        if "\r" in whitespace_only:
+            two_newlines = "\r\n\r\n"
+        
+        whitespace_only_trimmed = re.sub(cut_vspace, two_newlines, whitespace_only)
 
-            brd_logger.debug(f"{filepath}: {(whitespace_only_trimmed)}")
-            vector += list(whitespace_only_trimmed)
+        brd_logger.debug(f"{filepath}: {(whitespace_only_trimmed)}")
+        vector += list(whitespace_only_trimmed)
 
     except Exception as err:
-        brd_logger.error(f"Error turning {filepath} to a comparable vector: {type(filepath)}: {err}")
-        exit(76)
+        raise brderror(f"Error turning {filepath} to a comparable vector: {type(err)}: {err}", 76) from err
 
     return vector
 
@@ -50,3 +54,26 @@ def compare_vectors(a, b):
     similarity_score = (similarity_score1 + similarity_score2) / 2
     brd_logger.debug(f"Comparison yielded a score of: {similarity_score} - {similarity_score1:.2} & {similarity_score2:.2}")
     return similarity_score
+
+# return a score that compare_vectors(a, b) can not exceed, cheaply
+# quick_ratio counts shared characters regardless of order, so it bounds both ratio() calls
+def upper_bound(a, b):
+    S.set_seq1(a)
+    S.set_seq2(b)
+    return S.quick_ratio() * 10
+
+# Whitespace vectors use only a few distinct characters and autojunk is off, so ratio() is close to its quadratic worst case
+# Measured on typical source files; compare_vectors takes about this many seconds per len(a) * len(b)
+SECONDS_PER_COMPARISON_CELL = 1.5e-6
+
+# return roughly how many seconds compare_vectors(a, b) would take
+def comparison_cost(a, b):
+    return len(a) * len(b) * SECONDS_PER_COMPARISON_CELL
+
+# turn a vector into the fingerprints approximate_compare_vectors works on
+def vector_to_fingerprints(vector):
+    return brdapprox.line_fingerprints(vector)
+
+# return an approximate score from two vectors' fingerprints, for pairs too costly to compare exactly
+def approximate_compare_vectors(fingerprints_a, fingerprints_b):
+    return brdapprox.approximate_ratio(fingerprints_a, fingerprints_b)
@@ -1,22 +1,32 @@
 import logging
+import brdbatch
 
 brd_logger = logging.getLogger('brd_log')
 
 # turn a file into a comparable vector
 # for winnowing, we need to read the paper
-def file_to_vector(filepath):
+# contents may hold the file's bytes if they are already in memory
+def file_to_vector(filepath, contents=None):
 
     vector = {}
 
     try:
-        with open(filepath) as infile:
-            raw_contents = infile.read()
+        if contents is None:
+            with open(filepath) as infile:
+                raw_contents = infile.read()
+        else:
+            raw_contents = contents.decode()
 
     except Exception as err:
         brd_logger.error(f"Error turning {filepath} to a comparable vector: {type(filepath)}: {err}")
 
     return vector
 
-# return a similarity score between 1-10
+# return a similarity score between 0-10
+# the vector's keys are its fingerprints, so this is the jaccard similarity of the two fingerprint sets
 def compare_vectors(a, b):
-    return len(a)
\ No newline at end of file
+    return brdbatch.jaccard_score(a, b)
+
+# return a score that compare_vectors(a, b) can not exceed, cheaply
+def upper_bound(a, b):
+    return brdbatch.jaccard_upper_bound(a, b)
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# BRD's modules import each other by name from src/, as they do when brd.py is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
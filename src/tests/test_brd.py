@@ -0,0 +1,78 @@
+import io
+import os
+
+import pytest
+
+import brd
+import brdanalyzer
+from brderror import brderror
+
+FILES = {
+    "a.py": "def add(a, b):\n    return a + b\n",
+    "b.py": "def add(x, y):\n    return x + y\n",
+    "c.py": "print('hello world')\n",
+}
+
+
+def write_files(directory):
+    for name, data in FILES.items():
+        (directory / name).write_text(data)
+    return [str(directory / name) for name in FILES]
+
+
+def names(scores):
+    return {test: [[os.path.basename(a), os.path.basename(b), score] for a, b, score in results] for test, results in scores.items()}
+
+
+@pytest.mark.parametrize("as_buffer", [
+    lambda data: data,
+    lambda data: data.encode(),
+    lambda data: io.BytesIO(data.encode()),
+    lambda data: io.StringIO(data),
+])
+def test_in_memory_contents_match_files_on_disk(tmp_path, as_buffer):
+    on_disk = brd.analyze(write_files(tmp_path))
+    in_memory = brd.analyze({name: as_buffer(data) for name, data in FILES.items()})
+    assert names(in_memory.scores) == names(on_disk.scores)
+    assert in_memory.filelist == list(FILES)
+
+
+@pytest.mark.parametrize("kwargs, code", [
+    (dict(files=[]), 11),
+    (dict(files=FILES, max_filecount=2), 12),
+    (dict(files=FILES, max_size=0.00001), 13),
+    (dict(files=["does/not/exist.py"]), 3),
+    (dict(files=FILES, thresholds={"Unknown Test": 5}), 14),
+    (dict(files=FILES, thresholds={"Winnowing Hash Test": "high"}), 14),
+    (dict(files=FILES, thresholds={"Winnowing Hash Test": 11}), 14),
+    (dict(files=FILES, top_k=0), 14),
+    (dict(files=FILES, top_k=1.5), 14),
+    (dict(files=FILES, comparison_budget="lots"), 14),
+    (dict(files=FILES, comparison_budget=0), 14),
+])
+def test_bad_inputs_raise_brderror_with_exit_codes(kwargs, code):
+    with pytest.raises(brderror) as err:
+        brd.analyze(**kwargs)
+    assert err.value.code == code
+
+
+def test_numeric_strings_are_accepted_like_on_the_command_line():
+    results = brd.analyze(FILES, thresholds={"Winnowing Hash Test": "7"}, comparison_budget="5")
+    assert results.thresholds["Winnowing Hash Test"] == 7
+
+
+def test_main_exits_with_the_brderror_code(tmp_path):
+    with pytest.raises(SystemExit) as exit:
+        brd.main([str(tmp_path / "missing")])
+    assert exit.value.code == 4
+
+
+def test_report_and_results_share_one_clustering_pass(tmp_path, monkeypatch):
+    calls = []
+    compute_clusters = brdanalyzer.brdanalyzer._compute_clusters
+    monkeypatch.setattr(brdanalyzer.brdanalyzer, "_compute_clusters", lambda self: calls.append(self) or compute_clusters(self))
+
+    results = brd.analyze(FILES, outfile=str(tmp_path / "report.md"))
+    assert len(calls) == 1
+    assert results.outfile == str(tmp_path / "report.md")
+    assert os.path.exists(results.outfile)
@@ -0,0 +1,54 @@
+import random
+
+import brd
+
+
+def random_files(count, seed):
+    rng = random.Random(seed)
+    alphabet = " \n\tabcde"
+    return {f"f{i:02d}.py": "".join(rng.choice(alphabet) for _ in range(rng.randint(5, 120))) for i in range(count)}
+
+
+def test_top_k_keeps_every_files_true_k_best_matches():
+    files = random_files(25, 3)
+    full = brd.analyze(files)
+    assert full.top_k is None
+
+    for k in [1, 2, 3]:
+        results = brd.analyze(files, top_k=k)
+        assert results.top_k == k
+
+        for test, all_scores in full.scores.items():
+            kept = {tuple(result) for result in results.scores[test]}
+            assert kept <= {tuple(result) for result in all_scores}
+            assert len(kept) <= k * len(files)
+
+            for file in files:
+                matches = sorted((r for r in all_scores if file in r[:2]), key=lambda r: r[2], reverse=True)
+                if len(matches) <= k:
+                    assert {tuple(r) for r in matches} <= kept
+                    continue
+                # Matches tied with the k-th best may be kept or dropped, anything better must be kept
+                kth_best = matches[k - 1][2]
+                assert {tuple(r) for r in matches if r[2] > kth_best} <= kept
+                assert len([r for r in matches if tuple(r) in kept and r[2] >= kth_best]) >= k
+
+
+def test_top_k_larger_than_filecount_keeps_everything():
+    files = random_files(6, 4)
+    full = brd.analyze(files)
+    results = brd.analyze(files, top_k=10)
+    assert results.scores == full.scores
+
+
+def test_top_k_only_notes_kept_pairs_as_approximate():
+    files = random_files(12, 5)
+    # A budget this small approximates every gestalt comparison
+    everything = brd.analyze(files, comparison_budget=1e-12)
+    results = brd.analyze(files, top_k=1, comparison_budget=1e-12)
+
+    kept = {(test, a, b) for test, scores in results.scores.items() for a, b, _ in scores}
+    assert results.approximate
+    assert results.approximate <= kept
+    assert len(results.approximate) < len(everything.approximate)
+    assert {(test, a, b) for test, a, b in everything.approximate if (test, a, b) in kept} == results.approximate
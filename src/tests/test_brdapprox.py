@@ -0,0 +1,91 @@
+import itertools
+import os
+import random
+
+import pytest
+
+import brd
+import brdtokenngram
+import brdwhitespace
+
+# Fixed snapshots of real source files, so the inputs don't change as BRD itself does
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test", "approx")
+UNRELATED = ["driver.py", "analyzer.py", "ignorelist.py", "winnow.py"]
+# whitespace.py and tokenngram.py were written from the same template
+RELATED = ["whitespace.py", "tokenngram.py"]
+
+
+def read(name):
+    with open(os.path.join(FIXTURES, name), "rb") as infile:
+        return infile.read()
+
+
+def fragment(name, lines=60):
+    return b"\n".join(read(name).split(b"\n")[:lines])
+
+
+def lightly_edited(data, seed):
+    rng = random.Random(seed)
+    out = []
+    for line in data.split(b"\n"):
+        r = rng.random()
+        if r < 0.05:
+            continue
+        if r < 0.1:
+            line = b"    " + line
+        out.append(line)
+    return b"\n".join(out)
+
+
+def exact_and_approximate(module, a, b):
+    va = module.file_to_vector("a", a)
+    vb = module.file_to_vector("b", b)
+    exact = module.compare_vectors(va, vb)
+    approximate = module.approximate_compare_vectors(module.vector_to_fingerprints(va), module.vector_to_fingerprints(vb))
+    return exact, approximate
+
+
+@pytest.mark.parametrize("module", [brdwhitespace, brdtokenngram])
+def test_approximation_does_not_overestimate_unrelated_files(module):
+    for a, b in itertools.combinations(UNRELATED, 2):
+        exact, approximate = exact_and_approximate(module, fragment(a), fragment(b))
+        assert approximate <= exact + 1, (a, b, exact, approximate)
+        assert approximate < 5, (a, b, exact, approximate)
+
+
+@pytest.mark.parametrize("module", [brdwhitespace, brdtokenngram])
+def test_approximation_still_finds_copies(module):
+    for seed, name in enumerate(UNRELATED + RELATED):
+        original = fragment(name)
+        exact, approximate = exact_and_approximate(module, original, lightly_edited(original, seed))
+        assert exact >= 5
+        assert approximate >= 5, (name, exact, approximate)
+
+    exact, approximate = exact_and_approximate(module, read(RELATED[0]), read(RELATED[1]))
+    assert exact >= 5
+    assert approximate >= 5, (RELATED, exact, approximate)
+
+
+@pytest.mark.parametrize("module", [brdwhitespace, brdtokenngram])
+def test_default_budget_only_applies_to_large_files(module):
+    # driver.py and analyzer.py are around 10KB each, a typical size for a submission
+    a = module.file_to_vector("driver.py", read("driver.py"))
+    b = module.file_to_vector("analyzer.py", read("analyzer.py"))
+    assert module.comparison_cost(a, b) <= brd.COMPARISON_BUDGET_DEFAULT
+    assert module.comparison_cost(a * 20, b * 20) > brd.COMPARISON_BUDGET_DEFAULT
+
+
+def test_default_run_over_typical_files_matches_exact_run(tmp_path):
+    test = os.path.dirname(FIXTURES)
+    files = [os.path.join(test, "code.py")]
+    files += [os.path.join(test, "recursive", name) for name in ["code.py", "different.py", "differenter.py", "unique.py", "unique2.py"]]
+    files += [os.path.join(FIXTURES, name) for name in ["ignorelist.py", "winnow.py"] + RELATED]
+
+    default = brd.analyze(files, outfile=str(tmp_path / "default.md"))
+    exact = brd.analyze(files, outfile=str(tmp_path / "exact.md"), comparison_budget=None)
+
+    assert default.approximate == set()
+    assert default.scores == exact.scores
+    assert default.pairs == exact.pairs
+    report = lambda path: path.read_text().split("\n", 2)[2]
+    assert report(tmp_path / "default.md") == report(tmp_path / "exact.md")
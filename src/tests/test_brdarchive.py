@@ -0,0 +1,148 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+import brd
+import brdarchive
+from brderror import brderror
+
+FILES = {
+    "a.py": "def add(a, b):\n    return a + b\n",
+    "b.py": "def add(x, y):\n    return x + y\n",
+    "c.py": "print('hello world')\n",
+    "sub/d.py": "def sub(a, b):\n    return a - b\n",
+}
+
+
+def write_zip(path, files):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+
+
+def write_tgz(path, files):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in files.items():
+            data = data if isinstance(data, bytes) else data.encode()
+            info = tarfile.TarInfo("./" + name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def zip_bytes(files):
+    buffer = io.BytesIO()
+    write_zip(buffer, files)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("writer, name", [(write_zip, "subs.zip"), (write_tgz, "subs.tgz")])
+def test_members_are_named_by_archive_path(tmp_path, writer, name):
+    path = str(tmp_path / name)
+    writer(path, FILES)
+
+    flat = brd.discover_files(path)
+    assert sorted(flat) == [os.path.join(path, n) for n in ["a.py", "b.py", "c.py"]]
+    assert all(flat[os.path.join(path, n)].size == len(FILES[n]) for n in ["a.py", "b.py", "c.py"])
+
+    recursive = brd.discover_files(path, recursive=True)
+    assert sorted(recursive) == sorted(os.path.join(path, n) for n in FILES)
+    assert recursive[os.path.join(path, "sub/d.py")].read() == FILES["sub/d.py"].encode()
+
+
+def test_nested_archives_need_recursion(tmp_path):
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, {"a.py": FILES["a.py"], "inner.zip": zip_bytes({"b.py": FILES["b.py"]})})
+
+    assert sorted(brd.discover_files(path)) == [os.path.join(path, "a.py")]
+    assert sorted(brd.discover_files(path, recursive=True)) == [os.path.join(path, "a.py"), os.path.join(path, "inner.zip", "b.py")]
+
+
+def test_root_brdignore_applies_to_members(tmp_path):
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, dict(FILES, **{".brdignore": "*c.py\n"}))
+
+    # like in directories, the .brdignore file ignores itself
+    members = brd.discover_files(path, recursive=True)
+    assert sorted(members) == sorted(os.path.join(path, n) for n in ["a.py", "b.py", "sub/d.py"])
+
+
+def test_oversized_nested_archive_is_refused_before_it_is_opened(tmp_path, monkeypatch):
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, {"a.py": FILES["a.py"], "inner.zip": zip_bytes({"b.py": "x" * 100})})
+
+    opened = []
+    open_member = brdarchive.brdarchive.open_member
+    monkeypatch.setattr(brdarchive.brdarchive, "open_member", lambda self, info: opened.append(info) or open_member(self, info))
+
+    with pytest.raises(brderror) as err:
+        brd.discover_files(path, recursive=True, max_size=0.00001)
+    assert err.value.code == 13
+    assert opened == []
+
+
+def test_archive_scores_match_directory_scores(tmp_path):
+    directory = tmp_path / "subs"
+    for name, data in FILES.items():
+        (directory / name).parent.mkdir(parents=True, exist_ok=True)
+        (directory / name).write_text(data)
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, FILES)
+
+    from_directory = brd.analyze(brd.discover_files(str(directory), recursive=True))
+    from_archive = brd.analyze(brd.discover_files(path, recursive=True))
+
+    relative = lambda scores, root: sorted([os.path.relpath(a, root), os.path.relpath(b, root), s] for a, b, s in scores)
+    for test in from_directory.scores:
+        assert relative(from_archive.scores[test], path) == relative(from_directory.scores[test], str(directory))
+
+
+def test_archives_are_closed_after_analysis(tmp_path):
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, {"a.py": FILES["a.py"], "inner.zip": zip_bytes({"b.py": FILES["b.py"]})})
+
+    members = brd.discover_files(path, recursive=True)
+    brd.analyze(members)
+
+    for member in members.values():
+        assert member.archive.closed
+        assert member.archive.root().closed
+
+
+def test_oversized_brdignore_is_refused_before_it_is_read(tmp_path, monkeypatch):
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, dict(FILES, **{".brdignore": "*c.py\n" * 10}))
+
+    opened = []
+    open_member = brdarchive.brdarchive.open_member
+    monkeypatch.setattr(brdarchive.brdarchive, "open_member", lambda self, info: opened.append(info) or open_member(self, info))
+    closed = []
+    close = brdarchive.brdarchive.close
+    monkeypatch.setattr(brdarchive.brdarchive, "close", lambda self: closed.append(self) or close(self))
+
+    with pytest.raises(brderror) as err:
+        brd.discover_files(path, max_size=0.00005)
+    assert err.value.code == 13
+    assert opened == []
+    assert closed
+
+
+@pytest.mark.parametrize("kwargs, code", [
+    (dict(max_filecount=1), 12),
+    (dict(max_size=0.00001), 13),
+    (dict(top_k=0), 14),
+])
+def test_archives_are_closed_when_analysis_fails(tmp_path, kwargs, code):
+    path = str(tmp_path / "subs.zip")
+    write_zip(path, {"a.py": FILES["a.py"], "inner.zip": zip_bytes({"b.py": FILES["b.py"]})})
+
+    members = brd.discover_files(path, recursive=True)
+    with pytest.raises(brderror) as err:
+        brd.analyze(members, **kwargs)
+    assert err.value.code == code
+
+    for member in members.values():
+        assert member.archive.closed
+        assert member.archive.root().closed
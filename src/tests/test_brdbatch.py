@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+import brdbatch
+
+pytest.importorskip("numpy")
+
+
+def per_pair_scores(filelist, vectors):
+    results = []
+    for i, a in enumerate(filelist):
+        for j, b in enumerate(filelist):
+            if a <= b:
+                continue
+            results.append([a, b, brdbatch.jaccard_score(vectors[i], vectors[j])])
+    return results
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5, 37])
+def test_batched_scores_match_per_pair_scores(count):
+    rng = random.Random(count)
+    # Names are drawn with replacement, so duplicate names are covered too
+    filelist = [f"f{rng.randint(0, 20)}" for _ in range(count)]
+    vectors = [{rng.randint(0, 50): 0 for _ in range(rng.randint(0, 15))} for _ in range(count)]
+
+    expected = per_pair_scores(filelist, vectors)
+    batched = brdbatch.set_similarity_scores(filelist, vectors, row_block=4, feature_block=7)
+
+    assert batched == expected
+    assert all(type(score) in [int, float] for _, _, score in batched)
+
+
+def test_jaccard_upper_bound_bounds_jaccard_score():
+    rng = random.Random(0)
+    for _ in range(200):
+        a = {rng.randint(0, 30) for _ in range(rng.randint(0, 20))}
+        b = {rng.randint(0, 30) for _ in range(rng.randint(0, 20))}
+        assert brdbatch.jaccard_score(a, b) <= brdbatch.jaccard_upper_bound(a, b)